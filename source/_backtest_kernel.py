@@ -0,0 +1,92 @@
+import numpy as np
+from functools import lru_cache
+from typing import Callable, Optional, Tuple
+from source.portfolio import BUY, SELL
+
+
+def replay(
+    close: np.ndarray,
+    signals: np.ndarray,
+    initial_cash: float,
+    max_position_size: float,
+    max_portfolio_risk: float,
+    stop_loss_pct: float,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """Replay precomputed signals bar by bar for a single long-only symbol.
+
+    Mirrors the Portfolio/RiskManager loop in Backtester.run_backtest and
+    returns (portfolio_values, trade_index, trade_action, trade_quantity),
+    where portfolio_values has one leading entry for the initial cash.
+    """
+    n = len(close)
+    portfolio_values = np.empty(n + 1, dtype=np.float64)
+    portfolio_values[0] = initial_cash
+
+    trade_index = np.empty(n, dtype=np.int32)
+    trade_action = np.empty(n, dtype=np.int8)
+    trade_quantity = np.empty(n, dtype=np.int64)
+    n_trades = 0
+
+    cash = initial_cash
+    quantity = 0
+    position = 0  # Current position: 0=neutral, 1=long
+
+    for i in range(n):
+        price = close[i]
+        signal = signals[i]
+
+        if signal == 1 and position <= 0:  # Buy signal
+            # Same arithmetic as RiskManager.calculate_position_size
+            stop_loss = price * (1.0 - stop_loss_pct)
+            portfolio_value = cash + quantity * price
+            risk_per_share = abs(price - stop_loss)
+            size = 0
+            if risk_per_share != 0:
+                max_risk_amount = portfolio_value * max_portfolio_risk
+                max_shares_by_risk = int(max_risk_amount / risk_per_share)
+                max_position_value = portfolio_value * max_position_size
+                max_shares_by_size = int(max_position_value / price)
+                size = min(max_shares_by_risk, max_shares_by_size)
+
+            cost = size * price
+            if size > 0 and cost <= cash:
+                cash -= cost
+                quantity += size
+                position = 1
+                trade_index[n_trades] = i
+                trade_action[n_trades] = BUY
+                trade_quantity[n_trades] = size
+                n_trades += 1
+
+        elif signal == -1 and position >= 0:  # Sell signal
+            if quantity > 0:
+                cash += quantity * price
+                trade_index[n_trades] = i
+                trade_action[n_trades] = SELL
+                trade_quantity[n_trades] = quantity
+                n_trades += 1
+                quantity = 0
+                position = 0
+
+        portfolio_values[i + 1] = cash + quantity * price
+
+    return (
+        portfolio_values,
+        trade_index[:n_trades],
+        trade_action[:n_trades],
+        trade_quantity[:n_trades],
+    )
+
+
+@lru_cache(maxsize=None)
+def compiled_replay() -> Optional[Callable]:
+    """Return replay compiled with numba, or None if numba is not installed.
+
+    numba is imported on first use only: importing it and loading the cached
+    kernel costs a few hundred milliseconds per process.
+    """
+    try:
+        from numba import njit
+    except ImportError:  # numba is optional, the backtester falls back to Python
+        return None
+    return njit(cache=True)(replay)
@@ -1,8 +1,47 @@
+import os
+import numpy as np
 import pandas as pd
-from typing import Dict, List, Any
-from source.portfolio import Portfolio
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Callable, Dict, List, Any, Optional, Tuple
+from source._backtest_kernel import compiled_replay
+from source.portfolio import BUY, SELL, Portfolio
 from source.risk_manager import RiskManager
 
+STOP_LOSS_PCT = 0.05  # 5% stop loss below the entry price
+# Bars from which the numba kernel beats the Python replay including its
+# one-off import and load cost; measured per fresh process with a warm numba
+# cache, numba still loses at 500k bars and wins from about 1M
+COMPILED_MIN_BARS = 1_000_000
+
+
+def _run_one(
+    data: pd.DataFrame,
+    strategy: Any,
+    symbol: str,
+    initial_cash: float,
+    commission: float,
+) -> Dict[str, Any]:
+    """Run a single-symbol backtest in a worker process."""
+    return Backtester(initial_cash, commission).run_backtest(data, strategy, symbol)
+
+
+def _uses_array_signals(strategy: Any) -> bool:
+    """Whether strategy's signals come from calculate_signals_array.
+
+    A subclass that overrides get_signal below the class defining
+    calculate_signals_array keeps its per-bar get_signal.
+    """
+    mro = type(strategy).__mro__
+
+    def owner(name: str) -> Optional[int]:
+        return next((i for i, cls in enumerate(mro) if name in vars(cls)), None)
+
+    array_owner = owner("calculate_signals_array")
+    if array_owner is None:
+        return False
+    signal_owner = owner("get_signal")
+    return signal_owner is None or array_owner <= signal_owner
+
 
 class Backtester:
     """Simple backtesting engine for trading strategies."""
@@ -16,25 +55,135 @@ class Backtester:
         self, data: pd.DataFrame, strategy: Any, symbol: str
     ) -> Dict[str, Any]:
         """Run backtest for given strategy and data."""
-        portfolio = Portfolio(self.initial_cash)
         risk_manager = RiskManager()
+        signals = self._generate_signals(data, strategy)
 
-        portfolio_values = [self.initial_cash]
-        trades = []
-        position = 0  # Current position: 0=neutral, 1=long, -1=short
+        # Plain arrays for the bar loop; pandas indexing is too slow per bar
+        close_np = data["close"].to_numpy(dtype=np.float64)
+        dates_np = data.index.to_numpy()
+
+        use_compiled = (
+            len(close_np) >= COMPILED_MIN_BARS and compiled_replay() is not None
+        )
+        replay_signals = (
+            self._replay_compiled if use_compiled else self._replay_portfolio
+        )
+        portfolio_values, trade_index, trade_action, trade_quantity = replay_signals(
+            close_np, dates_np, signals, symbol, risk_manager
+        )
+        trade_price = close_np[trade_index]
+        trades = self._build_trades(
+            data.index, trade_index, trade_action, trade_price, trade_quantity
+        )
+
+        # Calculate performance metrics
+        returns = self._calculate_returns(portfolio_values)
+
+        final_value = float(portfolio_values[-1])
+        self.results = {
+            "final_value": final_value,
+            "total_return": (final_value - self.initial_cash) / self.initial_cash,
+            "total_trades": len(trades),
+            "portfolio_values": portfolio_values.tolist(),
+            "trades": trades,
+            "sharpe_ratio": risk_manager.calculate_sharpe_ratio(returns),
+            "max_drawdown": risk_manager.calculate_max_drawdown(portfolio_values),
+            "var_5": risk_manager.calculate_var(returns),
+            "win_rate": self._calculate_win_rate(trade_action, trade_price),
+        }
+
+        return self.results
+
+    def run_multi(
+        self,
+        data_by_symbol: Dict[str, pd.DataFrame],
+        strategy_factory: Callable[[], Any],
+        symbols: Optional[List[str]] = None,
+        max_workers: Optional[int] = None,
+    ) -> Dict[str, Dict[str, Any]]:
+        """Run independent backtests for several symbols in parallel.
+
+        strategy_factory is called once per symbol so each backtest gets a
+        fresh strategy; the strategies and data must be picklable.
+        """
+        if symbols is None:
+            symbols = list(data_by_symbol)
+
+        results: Dict[str, Dict[str, Any]] = {}
+        with ProcessPoolExecutor(max_workers=max_workers or os.cpu_count()) as ex:
+            futures = {
+                ex.submit(
+                    _run_one,
+                    data_by_symbol[symbol],
+                    strategy_factory(),
+                    symbol,
+                    self.initial_cash,
+                    self.commission,
+                ): symbol
+                for symbol in symbols
+            }
+            for future in as_completed(futures):
+                results[futures[future]] = future.result()
+
+        return {symbol: results[symbol] for symbol in symbols}
+
+    def _generate_signals(self, data: pd.DataFrame, strategy: Any) -> np.ndarray:
+        """Precompute the signal for every bar of the backtest."""
+        if _uses_array_signals(strategy):
+            # Vectorised strategies produce the whole signal vector in one pass
+            return strategy.calculate_signals_array(data["close"].to_numpy())
 
-        prices = data["close"].tolist()
+        close = data["close"]
+        signals = np.zeros(len(data), dtype=np.int8)
+        if hasattr(strategy, "get_signal"):
+            prices = close.tolist()
+            for i in range(len(prices)):
+                signals[i] = strategy.get_signal(prices[: i + 1])
+        else:
+            # For pandas-based strategies
+            for i in range(len(data)):
+                bar_signals = strategy.calculate_signals(close.iloc[: i + 1])
+                signals[i] = bar_signals.iloc[-1] if len(bar_signals) > 0 else 0
+        return signals
 
-        for i in range(len(data)):
-            current_price = data.iloc[i]["close"]
+    def _replay_compiled(
+        self,
+        close: np.ndarray,
+        dates: np.ndarray,
+        signals: np.ndarray,
+        symbol: str,
+        risk_manager: RiskManager,
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """Replay signals with the numba kernel."""
+        values, trade_index, trade_action, trade_quantity = compiled_replay()(
+            close,
+            np.asarray(signals, dtype=np.int8),
+            float(self.initial_cash),
+            risk_manager.max_position_size,
+            risk_manager.max_portfolio_risk,
+            STOP_LOSS_PCT,
+        )
+        return values, trade_index, trade_action, trade_quantity
+
+    def _replay_portfolio(
+        self,
+        close: np.ndarray,
+        dates: np.ndarray,
+        signals: np.ndarray,
+        symbol: str,
+        risk_manager: RiskManager,
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """Replay signals bar by bar through a Portfolio."""
+        portfolio = Portfolio(self.initial_cash)
 
-            # Get strategy signal
-            if hasattr(strategy, "get_signal"):
-                signal = strategy.get_signal(prices[: i + 1])
-            else:
-                # For pandas-based strategies
-                signals = strategy.calculate_signals(data["close"][: i + 1])
-                signal = signals.iloc[-1] if len(signals) > 0 else 0
+        portfolio_values = np.empty(len(close) + 1, dtype=np.float64)
+        portfolio_values[0] = self.initial_cash
+        trade_index = []
+        position = 0  # Current position: 0=neutral, 1=long, -1=short
+
+        for i in range(len(close)):
+            current_price = close[i]
+            signal = signals[i]
 
             # Execute trades based on signal
             if signal == 1 and position <= 0:  # Buy signal
@@ -43,99 +192,78 @@ class Backtester:
                     pass
 
                 # Calculate position size
-                stop_loss = current_price * 0.95  # 5% stop loss
-                portfolio_value = portfolio.get_total_value({symbol: current_price})
+                stop_loss = current_price * (1 - STOP_LOSS_PCT)
+                portfolio_value = portfolio.mark_to_market(symbol, current_price)
                 quantity = risk_manager.calculate_position_size(
                     portfolio_value, current_price, stop_loss
                 )
 
-                if quantity > 0 and portfolio.buy(symbol, quantity, current_price):
+                if quantity > 0 and portfolio.buy(
+                    symbol, quantity, current_price, dates[i]
+                ):
                     position = 1
-                    trades.append(
-                        {
-                            "date": data.index[i],
-                            "action": "BUY",
-                            "price": current_price,
-                            "quantity": quantity,
-                        }
-                    )
+                    trade_index.append(i)
 
             elif signal == -1 and position >= 0:  # Sell signal
-                current_quantity = portfolio.positions.get(symbol, 0)
+                current_quantity = portfolio.get_position(symbol)
                 if current_quantity > 0 and portfolio.sell(
-                    symbol, current_quantity, current_price
+                    symbol, current_quantity, current_price, dates[i]
                 ):
                     position = 0
-                    trades.append(
-                        {
-                            "date": data.index[i],
-                            "action": "SELL",
-                            "price": current_price,
-                            "quantity": current_quantity,
-                        }
-                    )
+                    trade_index.append(i)
 
             # Track portfolio value
-            portfolio_value = portfolio.get_total_value({symbol: current_price})
-            portfolio_values.append(portfolio_value)
+            portfolio_values[i + 1] = portfolio.mark_to_market(symbol, current_price)
 
-        # Calculate performance metrics
-        returns = self._calculate_returns(portfolio_values)
-
-        self.results = {
-            "final_value": portfolio_values[-1],
-            "total_return": (portfolio_values[-1] - self.initial_cash)
-            / self.initial_cash,
-            "total_trades": len(trades),
-            "portfolio_values": portfolio_values,
-            "trades": trades,
-            "sharpe_ratio": risk_manager.calculate_sharpe_ratio(returns),
-            "max_drawdown": risk_manager.calculate_max_drawdown(portfolio_values),
-            "var_5": risk_manager.calculate_var(returns),
-            "win_rate": self._calculate_win_rate(trades),
-        }
+        return (
+            portfolio_values,
+            np.array(trade_index, dtype=np.int32),
+            np.array(portfolio.trade_action, dtype=np.int8),
+            np.array(portfolio.trade_qty, dtype=np.int64),
+        )
 
-        return self.results
+    def _build_trades(
+        self,
+        dates: pd.Index,
+        trade_index: np.ndarray,
+        trade_action: np.ndarray,
+        trade_price: np.ndarray,
+        trade_quantity: np.ndarray,
+    ) -> List[Dict]:
+        """Materialise the trade arrays into the list of trade dicts."""
+        return [
+            {
+                "date": dates[i],
+                "action": "BUY" if action == BUY else "SELL",
+                "price": price,
+                "quantity": int(quantity),
+            }
+            for i, action, price, quantity in zip(
+                trade_index, trade_action, trade_price, trade_quantity
+            )
+        ]
 
-    def _calculate_returns(self, portfolio_values: List[float]) -> List[float]:
+    def _calculate_returns(self, portfolio_values: np.ndarray) -> np.ndarray:
         """Calculate daily returns from portfolio values."""
-        returns = []
-        for i in range(1, len(portfolio_values)):
-            daily_return = (
-                portfolio_values[i] - portfolio_values[i - 1]
-            ) / portfolio_values[i - 1]
-            returns.append(daily_return)
-        return returns
-
-    def _calculate_win_rate(self, trades: List[Dict]) -> float:
+        values = np.asarray(portfolio_values, dtype=np.float64)
+        return np.diff(values) / values[:-1]
+
+    def _calculate_win_rate(
+        self, trade_action: np.ndarray, trade_price: np.ndarray
+    ) -> float:
         """Calculate win rate from completed trades."""
-        if len(trades) < 2:
+        # Pair every SELL with the most recent BUY before it; a trailing
+        # BUY is still open and SELLs without a prior BUY are ignored
+        positions = np.arange(len(trade_action))
+        last_buy = np.maximum.accumulate(np.where(trade_action == BUY, positions, -1))
+        sells = np.flatnonzero(trade_action == SELL)
+        entries = last_buy[sells]
+        completed = entries >= 0
+        if not completed.any():
             return 0.0
 
-        profitable_trades = 0
-        total_completed_trades = 0
-
-        # Match buy and sell trades
-        for i in range(0, len(trades) - 1, 2):
-            if i + 1 < len(trades):
-                buy_trade = trades[i] if trades[i]["action"] == "BUY" else trades[i + 1]
-                sell_trade = (
-                    trades[i + 1] if trades[i + 1]["action"] == "SELL" else trades[i]
-                )
-
-                if buy_trade["action"] == "BUY" and sell_trade["action"] == "SELL":
-                    profit = (sell_trade["price"] - buy_trade["price"]) * buy_trade[
-                        "quantity"
-                    ]
-                    if profit > 0:
-                        profitable_trades += 1
-                    total_completed_trades += 1
-
-        return (
-            profitable_trades / total_completed_trades
-            if total_completed_trades > 0
-            else 0.0
-        )
+        wins = trade_price[sells[completed]] > trade_price[entries[completed]]
+        return float(wins.mean())
 
     def generate_report(self) -> str:
         """Generate a summary report of backtest results."""
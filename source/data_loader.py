@@ -1,7 +1,23 @@
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
-from typing import Optional, Dict, List
+from typing import Optional, Dict, List, Tuple
+
+
+def _rolling_sum(
+    cumsum: np.ndarray, nan_count: np.ndarray, window: int
+) -> np.ndarray:
+    """Rolling sums from zero-prefixed cumulative sums, like rolling().sum().
+
+    Windows that are not yet full or contain a NaN (per the cumulative
+    nan_count) are NaN.
+    """
+    sums = np.full(len(cumsum) - 1, np.nan)
+    if len(sums) >= window:
+        window_sums = cumsum[window:] - cumsum[:-window]
+        has_nan = nan_count[window:] != nan_count[:-window]
+        sums[window - 1 :] = np.where(has_nan, np.nan, window_sums)
+    return sums
 
 
 class DataLoader:
@@ -9,6 +25,8 @@ class DataLoader:
 
     def __init__(self) -> None:
         self.data_cache: Dict[str, pd.DataFrame] = {}
+        # Last generated sample per symbol: symbol -> (parameters, data)
+        self._sample_cache: Dict[str, Tuple[Tuple, pd.DataFrame]] = {}
 
     def generate_sample_data(
         self,
@@ -17,8 +35,18 @@ class DataLoader:
         start_price: float = 100.0,
         volatility: float = 0.02,
     ) -> pd.DataFrame:
-        """Generate sample stock price data for testing."""
-        np.random.seed(42)  # For reproducible results
+        """Generate sample stock price data for testing.
+
+        The last result per symbol is cached and repeat calls with the same
+        parameters return a copy of it, so callers may mutate what they get.
+        """
+        params = (days, start_price, volatility)
+        cached = self._sample_cache.get(symbol)
+        if cached is not None and cached[0] == params:
+            self.data_cache[symbol] = cached[1]
+            return cached[1].copy()
+
+        rng = np.random.default_rng(42)  # For reproducible results
 
         # Generate dates
         end_date = datetime.now()
@@ -26,20 +54,22 @@ class DataLoader:
         dates = pd.date_range(start=start_date, end=end_date, freq="D")[:days]
 
         # Generate price data using geometric Brownian motion
-        returns = np.random.normal(0.0005, volatility, days)  # Small positive drift
+        returns = rng.normal(0.0005, volatility, days)  # Small positive drift
+        returns[0] = 0  # First bar opens at start_price
+        prices = start_price * np.cumprod(1 + returns)
 
-        prices = [start_price]
-        for ret in returns[1:]:
-            prices.append(prices[-1] * (1 + ret))
+        # Intraday high/low noise, drawn for all bars at once
+        high_noise = np.abs(rng.normal(0, 0.01, days))
+        low_noise = np.abs(rng.normal(0, 0.01, days))
 
         # Create OHLCV data
         data = pd.DataFrame(
             {
                 "open": prices,
-                "high": [p * (1 + abs(np.random.normal(0, 0.01))) for p in prices],
-                "low": [p * (1 - abs(np.random.normal(0, 0.01))) for p in prices],
+                "high": prices * (1 + high_noise),
+                "low": prices * (1 - low_noise),
                 "close": prices,
-                "volume": np.random.randint(100000, 1000000, days),
+                "volume": rng.integers(100000, 1000000, days),
             },
             index=dates,
         )
@@ -48,8 +78,9 @@ class DataLoader:
         data["high"] = data[["open", "close", "high"]].max(axis=1)
         data["low"] = data[["open", "close", "low"]].min(axis=1)
 
+        self._sample_cache[symbol] = (params, data)
         self.data_cache[symbol] = data
-        return data
+        return data.copy()
 
     def load_csv_data(self, file_path: str, symbol: str) -> pd.DataFrame:
         """Load data from CSV file."""
@@ -75,18 +106,32 @@ class DataLoader:
         start_date: Optional[str] = None,
         end_date: Optional[str] = None,
     ) -> pd.DataFrame:
-        """Get price data for symbol within date range."""
+        """Get price data for symbol within date range.
+
+        The result is the cached DataFrame itself, or a slice of it when a
+        date range is given, so callers must not mutate it.
+        """
         if symbol not in self.data_cache:
             self.generate_sample_data(symbol)
 
-        data = self.data_cache[symbol].copy()
+        data = self.data_cache[symbol]
+        if not start_date and not end_date:
+            return data
 
-        if start_date:
-            data = data[data.index >= start_date]
-        if end_date:
-            data = data[data.index <= end_date]
+        if not data.index.is_monotonic_increasing:
+            # Unsorted data needs a full boolean mask
+            if start_date:
+                data = data[data.index >= start_date]
+            if end_date:
+                data = data[data.index <= end_date]
+            return data
 
-        return data
+        # Sorted index: binary-search the bounds instead of comparing every row
+        start = data.index.searchsorted(start_date, side="left") if start_date else 0
+        end = (
+            data.index.searchsorted(end_date, side="right") if end_date else len(data)
+        )
+        return data.iloc[start:end]
 
     def get_latest_price(self, symbol: str) -> float:
         """Get the latest price for a symbol."""
@@ -106,10 +151,21 @@ class DataLoader:
         """Add common technical indicators to price data."""
         df = data.copy()
 
+        # One shared cumulative sum serves every SMA window; prices are
+        # offset by the first valid close to keep the running sum
+        # well-conditioned, and missing closes are zero-filled and counted
+        close = df["close"].to_numpy(dtype=np.float64)
+        missing = np.isnan(close)
+        valid = close[~missing]
+        offset = valid[0] if len(valid) else 0.0
+        centered = np.where(missing, 0.0, close - offset)
+        csum = np.concatenate(([0.0], np.cumsum(centered)))
+        nan_count = np.concatenate(([0], np.cumsum(missing)))
+
         # Simple Moving Averages
-        df["sma_10"] = df["close"].rolling(window=10).mean()
-        df["sma_20"] = df["close"].rolling(window=20).mean()
-        df["sma_50"] = df["close"].rolling(window=50).mean()
+        for window in (10, 20, 50):
+            window_sum = _rolling_sum(csum, nan_count, window)
+            df[f"sma_{window}"] = offset + window_sum / window
 
         # Exponential Moving Averages
         df["ema_12"] = df["close"].ewm(span=12).mean()
@@ -120,18 +176,22 @@ class DataLoader:
         df["macd_signal"] = df["macd"].ewm(span=9).mean()
         df["macd_histogram"] = df["macd"] - df["macd_signal"]
 
-        # Bollinger Bands
-        df["bb_middle"] = df["close"].rolling(window=20).mean()
+        # Bollinger Bands; the std stays on pandas' rolling kernel, since a
+        # running sum of squares loses precision on long drifting series
         bb_std = df["close"].rolling(window=20).std()
+        df["bb_middle"] = df["sma_20"]
         df["bb_upper"] = df["bb_middle"] + (bb_std * 2)
         df["bb_lower"] = df["bb_middle"] - (bb_std * 2)
 
-        # RSI
-        delta = df["close"].diff()
-        gain = (delta.where(delta > 0, 0)).rolling(window=14).mean()
-        loss = (-delta.where(delta < 0, 0)).rolling(window=14).mean()
-        rs = gain / loss
-        df["rsi"] = 100 - (100 / (1 + rs))
+        # RSI with Wilder smoothing (EMA with alpha = 1/14)
+        delta = np.empty_like(close)
+        delta[:1] = 0
+        delta[1:] = np.diff(close)
+        gain = pd.Series(np.maximum(delta, 0)).ewm(alpha=1 / 14, adjust=False).mean()
+        loss = pd.Series(np.maximum(-delta, 0)).ewm(alpha=1 / 14, adjust=False).mean()
+        with np.errstate(divide="ignore", invalid="ignore"):
+            rs = gain.to_numpy() / loss.to_numpy()
+            df["rsi"] = 100 - (100 / (1 + rs))
 
         return df
 
@@ -1,5 +1,10 @@
+from array import array
 from datetime import datetime
-from typing import Dict, List
+from typing import Any, Dict, List, Optional
+
+# Trade action codes stored in Portfolio.trade_action
+BUY = 0
+SELL = 1
 
 
 class Portfolio:
@@ -8,48 +13,98 @@ class Portfolio:
     def __init__(self, initial_cash: float = 100000.0) -> None:
         self.cash = initial_cash
         self.positions: Dict[str, int] = {}  # symbol -> quantity
-        self.trades: List[Dict] = []
+        # Trade history stored column-wise, one entry per trade
+        self.trade_symbols: List[str] = []
+        self.trade_qty: List[int] = []
+        self.trade_price = array("d")
+        self.trade_action = array("b")  # BUY or SELL
+        self.trade_ts: List[Any] = []
+        # Quantity of the most recently traded symbol, for mark_to_market
+        self._single_symbol: Optional[str] = None
+        self._single_qty = 0
+
+    @property
+    def trades(self) -> List[Dict]:
+        """Trade history as a list of dicts, built on demand."""
+        return [
+            {
+                "symbol": symbol,
+                "quantity": quantity,
+                "price": price,
+                "action": "BUY" if action == BUY else "SELL",
+                "timestamp": timestamp,
+            }
+            for symbol, quantity, price, action, timestamp in zip(
+                self.trade_symbols,
+                self.trade_qty,
+                self.trade_price,
+                self.trade_action,
+                self.trade_ts,
+            )
+        ]
+
+    def _record_trade(
+        self,
+        symbol: str,
+        quantity: int,
+        price: float,
+        action: int,
+        timestamp: Optional[Any],
+    ) -> None:
+        """Append a trade to the column-wise trade history."""
+        price = float(price)  # Fail before any column has been appended to
+        self.trade_symbols.append(symbol)
+        self.trade_qty.append(quantity)
+        self.trade_price.append(price)
+        self.trade_action.append(action)
+        self.trade_ts.append(datetime.now() if timestamp is None else timestamp)
+
+    def buy(
+        self,
+        symbol: str,
+        quantity: int,
+        price: float,
+        timestamp: Optional[Any] = None,
+    ) -> bool:
+        """Buy shares if sufficient cash available.
 
-    def buy(self, symbol: str, quantity: int, price: float) -> bool:
-        """Buy shares if sufficient cash available."""
+        timestamp defaults to the current time; backtests pass the bar date.
+        """
         cost = quantity * price
         if cost > self.cash:
             return False
 
+        self._record_trade(symbol, quantity, price, BUY, timestamp)
         self.cash -= cost
         self.positions[symbol] = self.positions.get(symbol, 0) + quantity
-        self.trades.append(
-            {
-                "symbol": symbol,
-                "quantity": quantity,
-                "price": price,
-                "action": "BUY",
-                "timestamp": datetime.now(),
-            }
-        )
+        self._single_symbol = symbol
+        self._single_qty = self.positions[symbol]
         return True
 
-    def sell(self, symbol: str, quantity: int, price: float) -> bool:
+    def sell(
+        self,
+        symbol: str,
+        quantity: int,
+        price: float,
+        timestamp: Optional[Any] = None,
+    ) -> bool:
         """Sell shares if sufficient position available."""
         if self.positions.get(symbol, 0) < quantity:
             return False
 
+        self._record_trade(symbol, quantity, price, SELL, timestamp)
         self.cash += quantity * price
         self.positions[symbol] -= quantity
+        self._single_symbol = symbol
+        self._single_qty = self.positions[symbol]
         if self.positions[symbol] == 0:
             del self.positions[symbol]
-
-        self.trades.append(
-            {
-                "symbol": symbol,
-                "quantity": quantity,
-                "price": price,
-                "action": "SELL",
-                "timestamp": datetime.now(),
-            }
-        )
         return True
 
+    def get_position(self, symbol: str) -> int:
+        """Get quantity held for symbol."""
+        return self.positions.get(symbol, 0)
+
     def get_position_value(self, symbol: str, current_price: float) -> float:
         """Calculate current value of position."""
         return self.positions.get(symbol, 0) * current_price
@@ -61,10 +116,23 @@ class Portfolio:
             total += quantity * prices.get(symbol, 0)
         return total
 
+    def mark_to_market(self, symbol: str, price: float) -> float:
+        """Calculate total portfolio value when only symbol has a price.
+
+        Equivalent to get_total_value({symbol: price}) but avoids building a
+        prices dict and iterating over positions on every call.
+        """
+        if symbol == self._single_symbol:
+            quantity = self._single_qty
+        else:
+            quantity = self.positions.get(symbol, 0)
+        return self.cash + quantity * price
+
     def get_summary(self) -> Dict:
         """Get portfolio summary."""
         return {
             "cash": self.cash,
             "positions": self.positions.copy(),
-            "total_trades": len(self.trades),
+            "total_trades": len(self.trade_action),
         }
+
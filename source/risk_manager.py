@@ -1,4 +1,4 @@
-import math
+import numpy as np
 from typing import Dict, List
 
 
@@ -35,50 +35,36 @@ class RiskManager:
         self, returns: List[float], confidence_level: float = 0.05
     ) -> float:
         """Calculate Value at Risk (VaR) at given confidence level."""
-        if not returns:
+        if len(returns) == 0:
             return 0.0
 
-        sorted_returns = sorted(returns)
-        index = int(len(sorted_returns) * confidence_level)
-        return (
-            sorted_returns[index] if index < len(sorted_returns) else sorted_returns[-1]
-        )
+        r = np.asarray(returns, dtype=np.float64)
+        # Only one order statistic is needed, so select instead of sorting
+        index = min(int(len(r) * confidence_level), len(r) - 1)
+        return float(np.partition(r, index)[index])
 
     def calculate_sharpe_ratio(
         self, returns: List[float], risk_free_rate: float = 0.02
     ) -> float:
         """Calculate Sharpe ratio for given returns."""
-        if not returns or len(returns) < 2:
+        if len(returns) < 2:
             return 0.0
 
-        excess_returns = [
-            r - risk_free_rate / 252 for r in returns
-        ]  # Daily risk-free rate
-        avg_excess_return = sum(excess_returns) / len(excess_returns)
+        r = np.asarray(returns, dtype=np.float64)
+        avg_excess_return = r.mean() - risk_free_rate / 252  # Daily risk-free rate
+        std_dev = r.std()
 
-        # Calculate standard deviation
-        mean_return = sum(returns) / len(returns)
-        variance = sum((r - mean_return) ** 2 for r in returns) / len(returns)
-        std_dev = math.sqrt(variance)
-
-        return avg_excess_return / std_dev if std_dev > 0 else 0.0
+        return float(avg_excess_return / std_dev) if std_dev > 0 else 0.0
 
     def calculate_max_drawdown(self, portfolio_values: List[float]) -> float:
         """Calculate maximum drawdown from portfolio values."""
         if len(portfolio_values) < 2:
             return 0.0
 
-        peak = portfolio_values[0]
-        max_drawdown = 0.0
-
-        for value in portfolio_values[1:]:
-            if value > peak:
-                peak = value
-            else:
-                drawdown = (peak - value) / peak
-                max_drawdown = max(max_drawdown, drawdown)
-
-        return max_drawdown
+        values = np.asarray(portfolio_values, dtype=np.float64)
+        peaks = np.maximum.accumulate(values)
+        drawdowns = (peaks - values) / peaks
+        return float(drawdowns.max())
 
     def check_position_limits(
         self,
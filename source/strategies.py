@@ -1,4 +1,6 @@
+import numpy as np
 import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
 from typing import List
 
 
@@ -11,14 +13,21 @@ class MovingAverageStrategy:
 
     def calculate_signals(self, prices: pd.Series) -> pd.Series:
         """Generate buy/sell signals based on moving average crossover."""
-        short_ma = prices.rolling(window=self.short_window).mean()
-        long_ma = prices.rolling(window=self.long_window).mean()
+        signals = self._crossover_sign(prices).astype(np.int64)
+        return pd.Series(signals, index=prices.index)
 
-        signals = pd.Series(0, index=prices.index)
-        signals[short_ma > long_ma] = 1  # Buy signal
-        signals[short_ma < long_ma] = -1  # Sell signal
+    def calculate_signals_array(self, prices: np.ndarray) -> np.ndarray:
+        """Generate crossover signals for every bar of a price array at once."""
+        return self._crossover_sign(pd.Series(prices)).astype(np.int8)
 
-        return signals
+    def _crossover_sign(self, close: pd.Series) -> np.ndarray:
+        """Sign of short minus long moving average, 0 until both exist."""
+        short_ma = close.rolling(window=self.short_window).mean().to_numpy()
+        long_ma = close.rolling(window=self.long_window).mean().to_numpy()
+
+        diff = short_ma - long_ma
+        diff[np.isnan(diff)] = 0  # Not enough history yet - Hold
+        return np.sign(diff, out=diff)
 
     def get_signal(self, prices: List[float]) -> int:
         """Get current signal for latest prices."""
@@ -46,6 +55,20 @@ class MomentumStrategy:
         """Calculate momentum as percentage change over lookback period."""
         return prices.pct_change(self.lookback_period)
 
+    def calculate_signals_array(self, prices: np.ndarray) -> np.ndarray:
+        """Generate momentum signals for every bar of a price array at once."""
+        prices = np.asarray(prices, dtype=np.float64)
+        lookback = self.lookback_period
+
+        signals = np.zeros(len(prices), dtype=np.int8)
+        if len(prices) <= lookback:
+            return signals
+
+        momentum = (prices[lookback:] - prices[:-lookback]) / prices[:-lookback]
+        signals[lookback:][momentum > self.threshold] = 1  # Upward momentum - Buy
+        signals[lookback:][momentum < -self.threshold] = -1  # Downward momentum - Sell
+        return signals
+
     def get_signal(self, prices: List[float]) -> int:
         """Get momentum signal for latest prices."""
         if len(prices) < self.lookback_period + 1:
@@ -91,6 +114,34 @@ class RSIStrategy:
         rsi = 100 - (100 / (1 + rs))
         return rsi
 
+    def calculate_rsi_array(self, prices: np.ndarray) -> np.ndarray:
+        """Calculate RSI for every bar of a price array at once."""
+        prices = np.asarray(prices, dtype=np.float64)
+        rsi = np.full(len(prices), 50.0)  # Neutral RSI until enough history
+        if len(prices) < self.period + 1:
+            return rsi
+
+        deltas = np.diff(prices)
+        gains = sliding_window_view(np.maximum(deltas, 0), self.period)
+        losses = sliding_window_view(np.maximum(-deltas, 0), self.period)
+
+        avg_gain = gains.sum(axis=1) / self.period
+        avg_loss = losses.sum(axis=1) / self.period
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            rs = avg_gain / avg_loss
+        rsi[self.period :] = np.where(avg_loss == 0, 100, 100 - (100 / (1 + rs)))
+        return rsi
+
+    def calculate_signals_array(self, prices: np.ndarray) -> np.ndarray:
+        """Generate RSI signals for every bar of a price array at once."""
+        rsi = self.calculate_rsi_array(prices)
+
+        signals = np.zeros(len(rsi), dtype=np.int8)
+        signals[rsi < self.oversold] = 1  # Oversold - Buy
+        signals[rsi > self.overbought] = -1  # Overbought - Sell
+        return signals
+
     def get_signal(self, prices: List[float]) -> int:
         """Get RSI-based signal."""
         rsi = self.calculate_rsi(prices)
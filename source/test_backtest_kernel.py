@@ -0,0 +1,66 @@
+import unittest
+
+import numpy as np
+
+from source._backtest_kernel import compiled_replay, replay
+from source.back_tester import STOP_LOSS_PCT, Backtester
+from source.data_loader import DataLoader
+from source.risk_manager import RiskManager
+from source.strategies import MomentumStrategy, MovingAverageStrategy, RSIStrategy
+
+
+class TestBacktestKernel(unittest.TestCase):
+    """The array kernel must replay trades exactly like the Portfolio loop."""
+
+    def setUp(self) -> None:
+        data = DataLoader().generate_sample_data("TEST", days=2000)
+        self.close = data["close"].to_numpy(dtype=np.float64)
+        self.dates = data.index.to_numpy()
+        self.data = data
+        self.backtester = Backtester(initial_cash=100000)
+        self.risk_manager = RiskManager()
+
+    def _assert_same_replay(self, kernel, strategy) -> None:
+        signals = self.backtester._generate_signals(self.data, strategy)
+        expected = self.backtester._replay_portfolio(
+            self.close, self.dates, signals, "TEST", self.risk_manager
+        )
+        actual = kernel(
+            self.close,
+            signals,
+            float(self.backtester.initial_cash),
+            self.risk_manager.max_position_size,
+            self.risk_manager.max_portfolio_risk,
+            STOP_LOSS_PCT,
+        )
+
+        self.assertGreater(len(expected[1]), 0)
+        for got, want in zip(actual, expected):
+            np.testing.assert_array_equal(got, want)
+
+    def _strategies(self):
+        return [MovingAverageStrategy(10, 30), MomentumStrategy(), RSIStrategy()]
+
+    def test_replay_matches_portfolio_loop(self):
+        for strategy in self._strategies():
+            with self.subTest(strategy=type(strategy).__name__):
+                self._assert_same_replay(replay, strategy)
+
+    @unittest.skipIf(compiled_replay() is None, "numba is not installed")
+    def test_compiled_replay_matches_portfolio_loop(self):
+        for strategy in self._strategies():
+            with self.subTest(strategy=type(strategy).__name__):
+                self._assert_same_replay(compiled_replay(), strategy)
+
+    def test_replay_without_signals_holds_cash(self):
+        signals = np.zeros(len(self.close), dtype=np.int8)
+        values, trade_index, _, _ = replay(
+            self.close, signals, 100000.0, 0.1, 0.02, STOP_LOSS_PCT
+        )
+
+        self.assertEqual(len(trade_index), 0)
+        np.testing.assert_array_equal(values, np.full(len(self.close) + 1, 100000.0))
+
+
+if __name__ == "__main__":
+    unittest.main()